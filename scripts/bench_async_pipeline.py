@@ -0,0 +1,60 @@
+from __future__ import annotations
+"""
+End-to-end clip throughput vs concurrency with a stub model.
+
+Uses the offline replay backend with injected latency, so no network is
+needed. Each run writes reports to a fresh temp dir; overlays are skipped.
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from gatekeeper.async_pipeline import run_gatekeeper_many
+from gatekeeper.config import Settings
+from gatekeeper.pipeline import run_gatekeeper
+from gatekeeper.reasoning.backends import make_backend
+
+def make_jobs(samples: Path, work: Path, num_clips: int):
+    sources = sorted(samples.glob("*_detections.json"))
+    jobs = []
+    for k in range(num_clips):
+        data = json.loads(sources[k % len(sources)].read_text(encoding="utf-8"))
+        data["meta"]["clip_id"] = f"bench_{k}"
+        p = work / f"bench_{k}_detections.json"
+        p.write_text(json.dumps(data), encoding="utf-8")
+        jobs.append((work / f"bench_{k}.mp4", p))
+    return jobs
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--samples-dir", default="data/samples")
+    ap.add_argument("--clips", type=int, default=64)
+    ap.add_argument("--latency", type=float, default=0.1, help="Injected model latency in seconds")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    ap.add_argument("--write-workers", type=int, default=4)
+    args = ap.parse_args()
+
+    settings = Settings(reasoning_backend="replay", backend_latency_s=args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        jobs = make_jobs(Path(args.samples_dir), work, args.clips)
+
+        backend = make_backend(settings)
+        t0 = time.perf_counter()
+        for clip, det_path in jobs:
+            run_gatekeeper(clip, det_path, outputs_dir=work / "out_sync", try_overlay=False, settings=settings, backend=backend)
+        dt = time.perf_counter() - t0
+        print(f"sync run_gatekeeper:   {args.clips / dt:7.1f} clips/s")
+
+        for c in args.concurrency:
+            t0 = time.perf_counter()
+            run_gatekeeper_many(
+                jobs, outputs_dir=work / f"out_{c}", try_overlay=False, settings=settings,
+                concurrency=c, write_workers=args.write_workers,
+            )
+            dt = time.perf_counter() - t0
+            print(f"async concurrency={c:<3}: {args.clips / dt:7.1f} clips/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+"""
+Per-clip heuristics vs the multi-clip kernel on many tiny synthetic clips.
+"""
+import argparse
+import time
+import numpy as np
+from gatekeeper.io.schema import ClipDetections
+from gatekeeper.plausibility.batch import batch_heuristic_scores
+from gatekeeper.plausibility.consistency import compute_consistency_stats
+from gatekeeper.plausibility.heuristics import compute_track_stats, heuristic_score
+from gatekeeper.plausibility.tracks import build_track_arrays
+
+LIMITS = dict(max_speed_px_s=900.0, max_accel_px_s2=6000.0, max_jump_px=120.0)
+
+def make_tiny_clips(num_clips: int, tracks: int, frames: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dets = []
+    for k in range(num_clips):
+        pos = rng.uniform(0, 600, size=(tracks, 2))
+        vel = rng.uniform(-400, 400, size=(tracks, 2))
+        out = []
+        for f in range(frames):
+            c = pos + vel * (f / 30.0)
+            out.append({"t": f / 30.0, "objects": [
+                {"id": f"trk_{j}", "class": "car", "bbox_xyxy": [cx - 20, cy - 10, cx + 20, cy + 10], "confidence": 0.9}
+                for j, (cx, cy) in enumerate(c)
+            ]})
+        meta = {"clip_id": f"clip_{k}", "fps": 30.0, "frame_width": 640, "frame_height": 360}
+        dets.append(ClipDetections.model_validate({"meta": meta, "frames": out}))
+    return dets
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clips", type=int, default=2000)
+    ap.add_argument("--tracks", type=int, default=3)
+    ap.add_argument("--frames", type=int, default=10)
+    args = ap.parse_args()
+
+    dets = make_tiny_clips(args.clips, args.tracks, args.frames)
+
+    t0 = time.perf_counter()
+    for det in dets:
+        ts = compute_track_stats(det)
+        cs = compute_consistency_stats(build_track_arrays(det))
+        heuristic_score(ts, **LIMITS, consistency_stats=cs)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch_heuristic_scores(dets, **LIMITS)
+    t_batch = time.perf_counter() - t0
+
+    print(f"clips: {args.clips} ({args.tracks} tracks x {args.frames} frames each)")
+    print(f"per-clip:     {t_loop:.3f} s ({args.clips / t_loop:.0f} clips/s)")
+    print(f"batch kernel: {t_batch:.3f} s ({args.clips / t_batch:.0f} clips/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,42 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-from gatekeeper.pipeline import run_gatekeeper
+from gatekeeper.async_pipeline import ClipJobError, run_gatekeeper_many
+from gatekeeper.config import Settings
+from gatekeeper.io.detections import load_detections
+from gatekeeper.pipeline import run_gatekeeper, verdict_from_score
+from gatekeeper.plausibility.batch import batch_heuristic_scores
+from gatekeeper.reasoning.backends import make_backend
+
+def run_heuristics_only(det_files) -> None:
+    """
+    Audits every clip with the multi-clip heuristic kernel (no model, no overlay).
+    """
+    s = Settings()
+    dets = [load_detections(p) for p in det_files]
+    batch = batch_heuristic_scores(
+        dets,
+        max_speed_px_s=s.max_speed_px_s,
+        max_accel_px_s2=s.max_accel_px_s2,
+        max_jump_px=s.max_jump_px,
+        max_velocity_error_px_s=s.max_velocity_error_px_s,
+        max_area_ratio=s.max_area_ratio,
+        max_aspect_ratio=s.max_aspect_ratio,
+        max_conf_drop=s.max_conf_drop,
+        aggregate=s.heuristic_aggregate,
+        quantile=s.heuristic_quantile,
+        max_flagged=s.max_flagged_tracks or None,
+    )
+    for clip_id, score in zip(batch.clip_ids, batch.scores):
+        verdict = verdict_from_score(float(score), s.ok_threshold, s.questionable_threshold)
+        print(f"{clip_id}: {verdict} ({score:.2f}) [heuristics only]")
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--samples-dir", default="data/samples", help="Folder containing clips + *_detections.json")
     ap.add_argument("--outputs", default="outputs")
+    ap.add_argument("--heuristics-only", action="store_true", help="Score all clips in one vectorized heuristic pass")
+    ap.add_argument("--concurrency", type=int, default=1, help="Clips in flight (>1 uses the async pipeline)")
     args = ap.parse_args()
 
     samples = Path(args.samples_dir)
@@ -14,6 +44,11 @@ def main() -> None:
     if not det_files:
         raise SystemExit(f"No detections found in {samples}")
 
+    if args.heuristics_only:
+        run_heuristics_only(det_files)
+        return
+
+    jobs = []
     for det_path in det_files:
         clip_id = det_path.name.replace("_detections.json", "")
         # prefer mp4
@@ -21,8 +56,27 @@ def main() -> None:
         if not clip.exists():
             print(f"Skipping {clip_id}: missing {clip}")
             continue
-        out = run_gatekeeper(clip, det_path, outputs_dir=args.outputs, try_overlay=True)
-        print(f"{clip_id}: {out.verdict} ({out.plausibility_score:.2f})")
+        jobs.append((clip, det_path))
+
+    if args.concurrency > 1:
+        try:
+            outs = run_gatekeeper_many(jobs, outputs_dir=args.outputs, try_overlay=True, concurrency=args.concurrency)
+            failures = []
+        except ClipJobError as e:
+            outs, failures = e.results, e.failures
+        for out in outs:
+            if out is not None:
+                print(f"{out.clip_id}: {out.verdict} ({out.plausibility_score:.2f})")
+        for i, err in failures:
+            print(f"Failed {jobs[i][1]}: {type(err).__name__}: {err}")
+        if failures:
+            raise SystemExit(1)
+        return
+
+    backend = make_backend()
+    for clip, det_path in jobs:
+        out = run_gatekeeper(clip, det_path, outputs_dir=args.outputs, try_overlay=True, backend=backend)
+        print(f"{out.clip_id}: {out.verdict} ({out.plausibility_score:.2f})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .config import Settings
+from .io.schema import GatekeeperOutput
+from .pipeline import finalize_output, prepare_clip, write_outputs
+from .reasoning.backends import ReasoningBackend, make_backend
+
+ClipJob = Tuple[Union[str, Path], Union[str, Path]]  # (clip_path, detections_path)
+
+class ClipJobError(Exception):
+    """
+    Raised by run_gatekeeper_async after every job has finished when some
+    failed. `results` is in job order with None for failed jobs; `failures`
+    lists (job index, exception).
+    """
+    def __init__(self, results: List[Optional[GatekeeperOutput]], failures: List[Tuple[int, BaseException]]):
+        self.results = results
+        self.failures = sorted(failures, key=lambda f: f[0])
+        lines = [f"job {i}: {type(e).__name__}: {e}" for i, e in self.failures]
+        super().__init__(f"{len(failures)} of {len(results)} clip job(s) failed\n" + "\n".join(lines))
+
+async def run_gatekeeper_async(
+    jobs: Sequence[ClipJob],
+    outputs_dir: str | Path = "outputs",
+    try_overlay: bool = True,
+    settings: Optional[Settings] = None,
+    concurrency: int = 8,
+    write_queue_size: int = 16,
+    write_workers: int = 4,
+    cpu_workers: Optional[int] = None,
+    backend: Optional[ReasoningBackend] = None,
+) -> List[GatekeeperOutput]:
+    """
+    Same per-clip result as run_gatekeeper, but stages overlap across clips:
+    load + heuristics run in a thread pool, up to `concurrency` clips are in
+    flight (so model calls wait concurrently), and reports/overlays go to a
+    bounded queue drained by `write_workers`. A full queue blocks new
+    results, which holds their slot and throttles the stages upstream.
+    Results are returned in job order.
+
+    A failing job (bad detections file, write error, ...) does not stop the
+    others; once all jobs and queued writes are done, ClipJobError reports
+    the failures alongside the partial results.
+    """
+    settings = settings or Settings()
+    backend = backend or make_backend(settings)
+    loop = asyncio.get_running_loop()
+
+    results: List[Optional[GatekeeperOutput]] = [None] * len(jobs)
+    failures: List[Tuple[int, BaseException]] = []
+    queue: asyncio.Queue = asyncio.Queue(maxsize=write_queue_size)
+    slots = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=cpu_workers) as cpu_pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as model_pool, \
+            ThreadPoolExecutor(max_workers=write_workers) as io_pool:
+
+        async def writer() -> None:
+            while True:
+                i, out, det, clip_path = await queue.get()
+                try:
+                    await loop.run_in_executor(io_pool, write_outputs, out, det, clip_path, outputs_dir, try_overlay)
+                    results[i] = out
+                except Exception as e:
+                    failures.append((i, e))
+                finally:
+                    queue.task_done()
+
+        async def process(i: int, clip_path, detections_path) -> None:
+            async with slots:
+                try:
+                    prep = await loop.run_in_executor(cpu_pool, prepare_clip, detections_path, settings)
+                    resp = await backend.ainfer(prep.prompt["system"], prep.prompt["user"], model_pool)
+                    out = finalize_output(prep, resp, backend.provider, settings)
+                except Exception as e:
+                    failures.append((i, e))
+                    return
+                await queue.put((i, out, prep.det, clip_path))
+
+        writers = [asyncio.create_task(writer()) for _ in range(write_workers)]
+        try:
+            await asyncio.gather(*(process(i, c, d) for i, (c, d) in enumerate(jobs)))
+            await queue.join()
+        finally:
+            for w in writers:
+                w.cancel()
+            await asyncio.gather(*writers, return_exceptions=True)
+
+    if failures:
+        raise ClipJobError(results, failures)
+    return results  # type: ignore[return-value]
+
+def run_gatekeeper_many(jobs: Sequence[ClipJob], **kwargs) -> List[GatekeeperOutput]:
+    """
+    Blocking wrapper around run_gatekeeper_async for scripts.
+    """
+    return asyncio.run(run_gatekeeper_async(jobs, **kwargs))
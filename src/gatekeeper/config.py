@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 from dataclasses import dataclass
+from .plausibility.constraints import Constraints
 
 def _get_float(name: str, default: float) -> float:
     v = os.getenv(name)
@@ -17,11 +18,27 @@ class Settings:
     cosmos_api_key: str | None = os.getenv("COSMOS_API_KEY")
     cosmos_model: str = os.getenv("COSMOS_MODEL", "reason-2")
 
+    # Reasoning backend: "http" | "replay" | "subprocess"
+    reasoning_backend: str = os.getenv("GATEKEEPER_BACKEND", "http")
+    replay_path: str | None = os.getenv("GATEKEEPER_REPLAY_PATH")
+    subprocess_cmd: str | None = os.getenv("GATEKEEPER_SUBPROCESS_CMD")
+    backend_latency_s: float = _get_float("GATEKEEPER_BACKEND_LATENCY_S", 0.0)
+
     ok_threshold: float = _get_float("GATEKEEPER_OK_THRESHOLD", 0.70)
     questionable_threshold: float = _get_float("GATEKEEPER_QUESTIONABLE_THRESHOLD", 0.45)
 
+    # Heuristic aggregation: "sum" (default) | "mean" | "quantile"; 0 = flag every track
+    heuristic_aggregate: str = os.getenv("GATEKEEPER_HEURISTIC_AGGREGATE", "sum")
+    heuristic_quantile: float = _get_float("GATEKEEPER_HEURISTIC_QUANTILE", 0.9)
+    max_flagged_tracks: int = int(_get_float("GATEKEEPER_MAX_FLAGGED_TRACKS", 0))
+
     # Default constraints in pixel-space (demo friendly)
     max_speed_px_s: float = _get_float("MAX_SPEED_PX_S", 900.0)
     max_accel_px_s2: float = _get_float("MAX_ACCEL_PX_S2", 6000.0)
     max_jump_px: float = _get_float("MAX_JUMP_PX", 120.0)
 
+    # Tracker-consistency checks (ID swaps, teleports, bbox-shape jumps)
+    max_velocity_error_px_s: float = _get_float("MAX_VELOCITY_ERROR_PX_S", Constraints.max_velocity_error_px_s)
+    max_area_ratio: float = _get_float("MAX_AREA_RATIO", Constraints.max_area_ratio)
+    max_aspect_ratio: float = _get_float("MAX_ASPECT_RATIO", Constraints.max_aspect_ratio)
+    max_conf_drop: float = _get_float("MAX_CONF_DROP", Constraints.max_conf_drop)
@@ -1,56 +1,79 @@
 from __future__ import annotations
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from .config import Settings
 from .io.detections import load_detections
 from .io.schema import (
-    GatekeeperOutput, Evidence, CheckResult, FlaggedObject, ModelEvidence
+    ClipDetections, GatekeeperOutput, Evidence, CheckResult, FlaggedObject, ModelEvidence
 )
+from .plausibility.consistency import compute_consistency_arrays
 from .plausibility.constraints import Constraints
-from .plausibility.heuristics import compute_track_stats, heuristic_score
-from .plausibility.scoring import combine_scores
-from .reasoning.cosmos_client import CosmosClient
+from .plausibility.heuristics import compute_track_stats_arrays, heuristic_score_arrays, unstack_track_stats
+from .plausibility.scoring import combine_scores, verdict_from_score
+from .plausibility.tracks import build_track_arrays
+from .reasoning.backends import ReasoningBackend, make_backend
+from .reasoning.cosmos_client import CosmosResponse
 from .reasoning.prompt_templates import build_prompt_payload
 from .reasoning.postprocess import parse_model_output
 from .viz.report import write_json_report
 
-def verdict_from_score(score: float, ok_th: float, q_th: float) -> str:
-    if score >= ok_th:
-        return "OK"
-    if score >= q_th:
-        return "QUESTIONABLE"
-    return "IMPLAUSIBLE"
-
-def run_gatekeeper(
-    clip_path: str | Path,
-    detections_path: str | Path,
-    outputs_dir: str | Path = "outputs",
-    try_overlay: bool = True,
-    settings: Optional[Settings] = None,
-) -> GatekeeperOutput:
-    settings = settings or Settings()
+@dataclass(frozen=True)
+class PreparedClip:
+    """
+    Everything computed before the model call (load + heuristics + prompt).
+    """
+    det: ClipDetections
+    h_score: float
+    h_flagged: List[Tuple[str, str]]
+    prompt: Dict[str, str]
+
+def prepare_clip(detections_path: str | Path, settings: Settings) -> PreparedClip:
     det = load_detections(detections_path)
 
     constraints = Constraints(
         max_speed_px_s=settings.max_speed_px_s,
         max_accel_px_s2=settings.max_accel_px_s2,
         max_jump_px=settings.max_jump_px,
+        max_velocity_error_px_s=settings.max_velocity_error_px_s,
+        max_area_ratio=settings.max_area_ratio,
+        max_aspect_ratio=settings.max_aspect_ratio,
+        max_conf_drop=settings.max_conf_drop,
     )
 
-    track_stats = compute_track_stats(det)
-    h_score, h_flagged = heuristic_score(
-        track_stats,
+    # Flatten once; stats, consistency checks and scoring all share the arrays.
+    arr = build_track_arrays(det)
+    stats = compute_track_stats_arrays(arr)
+    h_score, h_flagged = heuristic_score_arrays(
+        stats,
         max_speed_px_s=constraints.max_speed_px_s,
         max_accel_px_s2=constraints.max_accel_px_s2,
         max_jump_px=constraints.max_jump_px,
+        consistency=compute_consistency_arrays(arr),
+        max_velocity_error_px_s=constraints.max_velocity_error_px_s,
+        max_area_ratio=constraints.max_area_ratio,
+        max_aspect_ratio=constraints.max_aspect_ratio,
+        max_conf_drop=constraints.max_conf_drop,
+        aggregate=settings.heuristic_aggregate,
+        quantile=settings.heuristic_quantile,
+        max_flagged=settings.max_flagged_tracks or None,
     )
 
     # Prepare reasoning prompt
-    prompt = build_prompt_payload(det, track_stats, asdict(constraints))
-    cosmos = CosmosClient(settings.cosmos_api_url, settings.cosmos_api_key, model=settings.cosmos_model)
-    cosmos_resp = cosmos.infer(prompt["system"], prompt["user"])
+    prompt = build_prompt_payload(det, unstack_track_stats(stats), asdict(constraints))
+    return PreparedClip(det=det, h_score=h_score, h_flagged=h_flagged, prompt=prompt)
+
+def finalize_output(
+    prep: PreparedClip,
+    cosmos_resp: CosmosResponse,
+    provider: str,
+    settings: Settings,
+) -> GatekeeperOutput:
+    """
+    Combines heuristic results with the model response into the final output.
+    """
+    h_score, h_flagged = prep.h_score, prep.h_flagged
 
     model_score = None
     model_verdict = None
@@ -82,7 +105,7 @@ def run_gatekeeper(
                 seen.add(oid)
 
     explanation = model_expl.strip() if model_expl.strip() else (
-        "Heuristic checks applied (speed/accel/jump). "
+        "Heuristic checks applied (speed/accel/jump/tracker consistency). "
         "Model reasoning unavailable or skipped."
     )
 
@@ -94,11 +117,11 @@ def run_gatekeeper(
 
     evidence = Evidence(
         checks=checks,
-        model=ModelEvidence(provider="cosmos", model_name=settings.cosmos_model, raw_response=cosmos_resp.raw_text[:2000] if cosmos_resp.raw_text else None),
+        model=ModelEvidence(provider=provider, model_name=settings.cosmos_model, raw_response=cosmos_resp.raw_text[:2000] if cosmos_resp.raw_text else None),
     )
 
-    out = GatekeeperOutput(
-        clip_id=det.meta.clip_id,
+    return GatekeeperOutput(
+        clip_id=prep.det.meta.clip_id,
         plausibility_score=float(final_score),
         verdict=final_verdict,  # type: ignore
         explanation=explanation,
@@ -106,6 +129,13 @@ def run_gatekeeper(
         evidence=evidence,
     )
 
+def write_outputs(
+    out: GatekeeperOutput,
+    det: ClipDetections,
+    clip_path: str | Path,
+    outputs_dir: str | Path,
+    try_overlay: bool = True,
+) -> None:
     outputs_dir = Path(outputs_dir)
     report_path = outputs_dir / "reports" / f"{det.meta.clip_id}_verdict.json"
     write_json_report(out, report_path)
@@ -113,7 +143,7 @@ def run_gatekeeper(
     if try_overlay:
         try:
             from .viz.render_overlay import render_overlay_video
-            flagged_ids: Set[str] = {fo.object_id for fo in flagged_objects}
+            flagged_ids: Set[str] = {fo.object_id for fo in out.flagged_objects}
             render_overlay_video(
                 clip_path=clip_path,
                 detections=det,
@@ -124,5 +154,25 @@ def run_gatekeeper(
             # Overlay is optional; do not fail the pipeline if unavailable.
             pass
 
+def run_gatekeeper(
+    clip_path: str | Path,
+    detections_path: str | Path,
+    outputs_dir: str | Path = "outputs",
+    try_overlay: bool = True,
+    settings: Optional[Settings] = None,
+    backend: Optional[ReasoningBackend] = None,
+) -> GatekeeperOutput:
+    """
+    Pass `backend` to reuse one reasoning backend across clips; otherwise
+    one is built from settings for this call.
+    """
+    settings = settings or Settings()
+    prep = prepare_clip(detections_path, settings)
+
+    backend = backend or make_backend(settings)
+    cosmos_resp = backend.infer(prep.prompt["system"], prep.prompt["user"])
+
+    out = finalize_output(prep, cosmos_resp, backend.provider, settings)
+    write_outputs(out, prep.det, clip_path, outputs_dir, try_overlay)
     return out
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..io.schema import ClipDetections
+from .consistency import compute_consistency_arrays
+from .constraints import Constraints
+from .heuristics import (
+    StatsArrays, TrackStats, compute_track_stats_arrays, consistency_block,
+    motion_block, unstack_track_stats,
+)
+from .tracks import build_batch_track_arrays
+
+@dataclass(frozen=True)
+class BatchHeuristics:
+    """
+    Heuristic results for many clips computed in one pass.
+    Clip i owns tracks track_offsets[i]:track_offsets[i + 1] of `stats`.
+    """
+    clip_ids: List[str]
+    scores: np.ndarray
+    flagged: List[List[Tuple[str, str]]]
+    stats: StatsArrays
+    track_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.clip_ids)
+
+    def track_stats(self, i: int) -> Dict[str, TrackStats]:
+        lo, hi = int(self.track_offsets[i]), int(self.track_offsets[i + 1])
+        s = self.stats
+        return unstack_track_stats(StatsArrays(
+            track_ids=s.track_ids[lo:hi],
+            max_speed=s.max_speed[lo:hi],
+            max_accel=s.max_accel[lo:hi],
+            max_jump=s.max_jump[lo:hi],
+            num_points=s.num_points[lo:hi],
+        ))
+
+def _per_clip_quantile(values: np.ndarray, clip: np.ndarray, num_clips: int, q: float) -> np.ndarray:
+    """
+    np.quantile (linear method) of `values` grouped by `clip`; NaN for empty clips.
+    """
+    order = np.lexsort((values, clip))
+    v = values[order]
+    counts = np.bincount(clip, minlength=num_clips)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    pos = q * np.maximum(counts - 1, 0)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+    frac = pos - lo
+    out = np.full(num_clips, np.nan)
+    has = counts > 0
+    v_lo = v[(offsets + lo)[has]]
+    v_hi = v[(offsets + hi)[has]]
+    out[has] = v_lo + (v_hi - v_lo) * frac[has]
+    return out
+
+def batch_heuristic_scores(
+    dets: Sequence[ClipDetections],
+    max_speed_px_s: float,
+    max_accel_px_s2: float,
+    max_jump_px: float,
+    max_velocity_error_px_s: float = Constraints.max_velocity_error_px_s,
+    max_area_ratio: float = Constraints.max_area_ratio,
+    max_aspect_ratio: float = Constraints.max_aspect_ratio,
+    max_conf_drop: float = Constraints.max_conf_drop,
+    aggregate: str = "sum",
+    quantile: float = 0.9,
+    max_flagged: Optional[int] = None,
+) -> BatchHeuristics:
+    """
+    compute_track_stats + consistency checks + heuristic_score for many clips
+    over one concatenated set of arrays, split back per clip.
+
+    Per-clip results equal heuristic_score(..., consistency_stats=...) with the
+    same arguments ("sum" totals may differ in the last float ulp).
+    """
+    if aggregate not in ("sum", "mean", "quantile"):
+        raise ValueError(f"Unknown aggregate {aggregate!r}; expected 'sum', 'mean' or 'quantile'")
+    if not 0.0 <= quantile <= 1.0:
+        raise ValueError(f"quantile must be in [0, 1], got {quantile!r}")
+
+    arr, track_offsets = build_batch_track_arrays(dets)
+    num_clips = len(dets)
+    track_clip = np.repeat(np.arange(num_clips), np.diff(track_offsets))
+
+    stats = compute_track_stats_arrays(arr)
+    blocks = [
+        motion_block(stats, max_speed_px_s, max_accel_px_s2, max_jump_px),
+        consistency_block(
+            compute_consistency_arrays(arr),
+            max_velocity_error_px_s, max_area_ratio, max_aspect_ratio, max_conf_drop,
+        ),
+    ]
+
+    # Both blocks come from the same arrays, so rows line up track for track.
+    per_track = sum(b.penalties.sum(axis=1) for b in blocks)
+    if aggregate == "sum":
+        scores = np.maximum(0.0, 1.0 - np.bincount(track_clip, weights=per_track, minlength=num_clips))
+    else:
+        counted = (stats.num_points >= 2)
+        p = np.clip(per_track[counted], 0.0, 1.0)
+        c = track_clip[counted]
+        if aggregate == "mean":
+            n = np.bincount(c, minlength=num_clips)
+            agg = np.bincount(c, weights=p, minlength=num_clips) / np.maximum(n, 1)
+        else:
+            agg = np.nan_to_num(_per_clip_quantile(p, c, num_clips, quantile), nan=0.0)
+        scores = 1.0 - agg
+
+    keep = None
+    if max_flagged is not None:
+        # Rank tracks inside each clip by penalty (desc), keep the top N offenders.
+        order = np.lexsort((-per_track, track_clip))
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.size) - track_offsets[track_clip[order]]
+        keep = (rank < max_flagged) & (per_track > 0)
+
+    flagged: List[List[Tuple[str, str]]] = [[] for _ in range(num_clips)]
+    for b in blocks:
+        mask = b.flags if keep is None else (b.flags & keep[:, None])
+        for r, c in zip(*np.nonzero(mask)):
+            flagged[track_clip[r]].append(
+                (b.track_ids[r], b.templates[c].format(v=b.values[r, c], lim=b.limits[c]))
+            )
+
+    return BatchHeuristics(
+        clip_ids=[d.meta.clip_id for d in dets],
+        scores=scores,
+        flagged=flagged,
+        stats=stats,
+        track_offsets=track_offsets,
+    )
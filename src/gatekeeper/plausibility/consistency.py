@@ -0,0 +1,113 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
+from .tracks import TrackArrays, segment_max
+
+@dataclass(frozen=True)
+class ConsistencyStats:
+    track_id: str
+    max_velocity_error: float  # px/s, |reported - finite-difference|
+    max_area_ratio: float      # >= 1, frame-to-frame bbox area change
+    max_aspect_ratio: float    # >= 1, frame-to-frame bbox w/h change
+    class_flips: int
+    id_switches: int           # tracker track_id changes under one object id
+    max_conf_drop: float
+    num_points: int
+
+@dataclass(frozen=True)
+class ConsistencyArrays:
+    """
+    Column-stacked ConsistencyStats; row j describes track_ids[j].
+    """
+    track_ids: List[str]
+    max_velocity_error: np.ndarray
+    max_area_ratio: np.ndarray
+    max_aspect_ratio: np.ndarray
+    class_flips: np.ndarray
+    id_switches: np.ndarray
+    max_conf_drop: np.ndarray
+    num_points: np.ndarray
+
+def stack_consistency_stats(stats: Dict[str, ConsistencyStats]) -> ConsistencyArrays:
+    css = list(stats.values())
+    return ConsistencyArrays(
+        track_ids=list(stats),
+        max_velocity_error=np.array([cs.max_velocity_error for cs in css], dtype=float),
+        max_area_ratio=np.array([cs.max_area_ratio for cs in css], dtype=float),
+        max_aspect_ratio=np.array([cs.max_aspect_ratio for cs in css], dtype=float),
+        class_flips=np.array([cs.class_flips for cs in css], dtype=np.int64),
+        id_switches=np.array([cs.id_switches for cs in css], dtype=np.int64),
+        max_conf_drop=np.array([cs.max_conf_drop for cs in css], dtype=float),
+        num_points=np.array([cs.num_points for cs in css], dtype=np.int64),
+    )
+
+def compute_consistency_stats(arr: TrackArrays) -> Dict[str, ConsistencyStats]:
+    ca = compute_consistency_arrays(arr)
+    return {
+        tid: ConsistencyStats(
+            track_id=tid,
+            max_velocity_error=float(ca.max_velocity_error[j]),
+            max_area_ratio=float(ca.max_area_ratio[j]),
+            max_aspect_ratio=float(ca.max_aspect_ratio[j]),
+            class_flips=int(ca.class_flips[j]),
+            id_switches=int(ca.id_switches[j]),
+            max_conf_drop=float(ca.max_conf_drop[j]),
+            num_points=int(ca.num_points[j]),
+        )
+        for j, tid in enumerate(ca.track_ids)
+    }
+
+def _segment_sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return np.zeros(starts.size, dtype=np.int64)
+    return np.add.reduceat(values, starts)
+
+def compute_consistency_arrays(arr: TrackArrays) -> ConsistencyArrays:
+    """
+    Tracker-consistency signals over the whole clip in one pass.
+    Every per-row quantity compares row i with row i-1 and is zeroed at
+    track boundaries, so per-track reductions are plain reduceat calls.
+    """
+    same = arr.same_track
+    prev = np.maximum(np.arange(arr.t.size) - 1, 0)
+
+    dt = arr.t - arr.t[prev]
+    dt_safe = np.where(dt <= 1e-9, 1e-9, dt)
+
+    x1, y1, x2, y2 = arr.bbox.T
+    w = np.maximum(x2 - x1, 1e-6)
+    h = np.maximum(y2 - y1, 1e-6)
+    center = np.stack([0.5 * (x1 + x2), 0.5 * (y1 + y2)], axis=1)
+
+    # Reported vs finite-difference velocity (rows without a report contribute 0).
+    fd_vel = (center - center[prev]) / dt_safe[:, None]
+    vel_err = np.hypot(*(arr.velocity - fd_vel).T)
+    vel_err = np.where(same & np.isfinite(vel_err), vel_err, 0.0)
+
+    # Symmetric ratios via |log| so growth and shrink are treated alike.
+    log_area = np.log(w * h)
+    log_aspect = np.log(w / h)
+    area_ratio = np.where(same, np.exp(np.abs(log_area - log_area[prev])), 1.0)
+    aspect_ratio = np.where(same, np.exp(np.abs(log_aspect - log_aspect[prev])), 1.0)
+
+    flips = (same & (arr.class_code != arr.class_code[prev])).astype(np.int64)
+
+    # Tracker id changing under one object id; rows without a track_id are skipped.
+    tid, tid_prev = arr.tracker_id, arr.tracker_id[prev]
+    switches = (same & (tid >= 0) & (tid_prev >= 0) & (tid != tid_prev)).astype(np.int64)
+
+    conf_drop = arr.confidence[prev] - arr.confidence
+    conf_drop = np.where(same & np.isfinite(conf_drop), np.maximum(conf_drop, 0.0), 0.0)
+
+    starts = arr.starts
+    return ConsistencyArrays(
+        track_ids=list(arr.track_ids),
+        max_velocity_error=segment_max(vel_err, starts),
+        max_area_ratio=segment_max(area_ratio, starts),
+        max_aspect_ratio=segment_max(aspect_ratio, starts),
+        class_flips=_segment_sum(flips, starts),
+        id_switches=_segment_sum(switches, starts),
+        max_conf_drop=segment_max(conf_drop, starts),
+        num_points=arr.counts,
+    )
@@ -7,3 +7,7 @@ class Constraints:
     max_accel_px_s2: float
     max_jump_px: float
 
+    max_velocity_error_px_s: float = 300.0
+    max_area_ratio: float = 2.0
+    max_aspect_ratio: float = 1.8
+    max_conf_drop: float = 0.5
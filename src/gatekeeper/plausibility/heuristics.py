@@ -1,8 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from ..io.schema import ClipDetections
+from .consistency import ConsistencyArrays, ConsistencyStats, stack_consistency_stats
+from .constraints import Constraints
+from .tracks import TrackArrays, build_track_arrays, segment_max
 
 @dataclass(frozen=True)
 class TrackStats:
@@ -12,91 +15,278 @@ class TrackStats:
     max_jump: float
     num_points: int
 
-def _center_xy(bbox_xyxy: List[float]) -> Tuple[float, float]:
-    x1, y1, x2, y2 = bbox_xyxy
-    return (0.5 * (x1 + x2), 0.5 * (y1 + y2))
+@dataclass(frozen=True)
+class StatsArrays:
+    """
+    Column-stacked TrackStats; row j describes track_ids[j].
+    """
+    track_ids: List[str]
+    max_speed: np.ndarray
+    max_accel: np.ndarray
+    max_jump: np.ndarray
+    num_points: np.ndarray
 
-def compute_track_stats(det: ClipDetections) -> Dict[str, TrackStats]:
+def stack_track_stats(track_stats: Dict[str, TrackStats]) -> StatsArrays:
+    sts = list(track_stats.values())
+    return StatsArrays(
+        track_ids=list(track_stats),
+        max_speed=np.array([st.max_speed for st in sts], dtype=float),
+        max_accel=np.array([st.max_accel for st in sts], dtype=float),
+        max_jump=np.array([st.max_jump for st in sts], dtype=float),
+        num_points=np.array([st.num_points for st in sts], dtype=np.int64),
+    )
+
+def compute_track_stats_arrays(arr: TrackArrays) -> StatsArrays:
     """
-    Computes speed/accel in pixel-space using bbox center differences.
+    Speed/accel/jump for every track in `arr` at once (bbox-center differences).
+    Works unchanged on concatenated multi-clip arrays.
     """
-    # Gather per-track time series
-    series: Dict[str, List[Tuple[float, float, float]]] = {}
-    for fr in det.frames:
-        t = float(fr.t)
-        for obj in fr.objects:
-            tid = obj.id
-            cx, cy = _center_xy(list(obj.bbox_xyxy))
-            series.setdefault(tid, []).append((t, cx, cy))
-
-    stats: Dict[str, TrackStats] = {}
-    for tid, pts in series.items():
-        pts_sorted = sorted(pts, key=lambda x: x[0])
-        if len(pts_sorted) < 2:
-            stats[tid] = TrackStats(tid, 0.0, 0.0, 0.0, len(pts_sorted))
-            continue
-
-        t = np.array([p[0] for p in pts_sorted], dtype=float)
-        x = np.array([p[1] for p in pts_sorted], dtype=float)
-        y = np.array([p[2] for p in pts_sorted], dtype=float)
-
-        dt = np.diff(t)
-        dx = np.diff(x)
-        dy = np.diff(y)
-
-        # Avoid divide-by-zero
-        dt_safe = np.where(dt <= 1e-9, 1e-9, dt)
-        speed = np.sqrt(dx * dx + dy * dy) / dt_safe
-        jump = np.sqrt(dx * dx + dy * dy)
-
-        if len(speed) >= 2:
-            ds = np.diff(speed)
-            dt2 = dt_safe[1:]
-            accel = ds / np.where(dt2 <= 1e-9, 1e-9, dt2)
-        else:
-            accel = np.array([0.0], dtype=float)
+    n = arr.t.size
+    same = arr.same_track
+    prev = np.maximum(np.arange(n) - 1, 0)
+
+    # Avoid divide-by-zero
+    dt = arr.t - arr.t[prev]
+    dt_safe = np.where(dt <= 1e-9, 1e-9, dt)
+
+    x = 0.5 * (arr.bbox[:, 0] + arr.bbox[:, 2])
+    y = 0.5 * (arr.bbox[:, 1] + arr.bbox[:, 3])
+    dx = x - x[prev]
+    dy = y - y[prev]
+    jump = np.sqrt(dx * dx + dy * dy)
+    speed = np.where(same, jump / dt_safe, 0.0)
+    jump = np.where(same, jump, 0.0)
 
-        stats[tid] = TrackStats(
+    # Accel needs two consecutive speeds inside the same track.
+    accel_ok = same & same[prev]
+    accel = np.where(accel_ok, np.abs((speed - speed[prev]) / dt_safe), 0.0)
+
+    return StatsArrays(
+        track_ids=list(arr.track_ids),
+        max_speed=segment_max(speed, arr.starts),
+        max_accel=segment_max(accel, arr.starts),
+        max_jump=segment_max(jump, arr.starts),
+        num_points=arr.counts,
+    )
+
+def unstack_track_stats(stats: StatsArrays) -> Dict[str, TrackStats]:
+    return {
+        tid: TrackStats(
             track_id=tid,
-            max_speed=float(np.max(speed)) if speed.size else 0.0,
-            max_accel=float(np.max(np.abs(accel))) if accel.size else 0.0,
-            max_jump=float(np.max(jump)) if jump.size else 0.0,
-            num_points=len(pts_sorted),
+            max_speed=float(stats.max_speed[j]),
+            max_accel=float(stats.max_accel[j]),
+            max_jump=float(stats.max_jump[j]),
+            num_points=int(stats.num_points[j]),
         )
-    return stats
+        for j, tid in enumerate(stats.track_ids)
+    }
 
-def heuristic_score(
-    track_stats: Dict[str, TrackStats],
+def compute_track_stats(det: ClipDetections) -> Dict[str, TrackStats]:
+    """
+    Computes speed/accel in pixel-space using bbox center differences.
+    """
+    return unstack_track_stats(compute_track_stats_arrays(build_track_arrays(det)))
+
+@dataclass(frozen=True)
+class PenaltyBlock:
+    """
+    One group of checks: values/penalties are (tracks, checks) matrices.
+    Reasons are formatted from `templates` only when a flag is emitted.
+    """
+    track_ids: List[str]
+    values: np.ndarray
+    limits: np.ndarray
+    penalties: np.ndarray
+    flags: np.ndarray
+    eligible: np.ndarray  # (tracks,) float 0/1, tracks with >= 2 points
+    templates: Tuple[str, ...]
+
+def _soft_penalty(values: np.ndarray, limits: np.ndarray, base, slope, cap) -> np.ndarray:
+    over = (values - limits) / limits
+    return np.where(values > limits, np.minimum(cap, base + slope * over), 0.0)
+
+def motion_block(stats: StatsArrays, max_speed_px_s: float, max_accel_px_s2: float, max_jump_px: float) -> PenaltyBlock:
+    """
+    Speed/accel/jump checks, one row per track in `stats`.
+    """
+    values = np.column_stack([stats.max_speed, stats.max_accel, stats.max_jump]).reshape(-1, 3)
+    limits = np.array([max_speed_px_s, max_accel_px_s2, max_jump_px], dtype=float)
+    eligible = stats.num_points >= 2
+
+    # Soft penalties so score degrades gracefully.
+    pen = _soft_penalty(values, limits, np.array([0.10, 0.15, 0.15]), np.array([0.25, 0.30, 0.30]), np.array([0.35, 0.45, 0.45]))
+    flags = eligible[:, None] & (values > limits)
+    return PenaltyBlock(
+        track_ids=stats.track_ids,
+        values=values,
+        limits=limits,
+        penalties=np.where(flags, pen, 0.0),
+        flags=flags,
+        eligible=eligible.astype(float),
+        templates=(
+            "speed {v:.1f} px/s > {lim:.1f}",
+            "accel {v:.1f} px/s^2 > {lim:.1f}",
+            "jump {v:.1f}px > {lim:.1f}px",
+        ),
+    )
+
+def consistency_block(
+    cons: ConsistencyArrays,
+    max_velocity_error_px_s: float,
+    max_area_ratio: float,
+    max_aspect_ratio: float,
+    max_conf_drop: float,
+) -> PenaltyBlock:
+    """
+    Tracker-consistency checks, one row per track in `cons`.
+    """
+    values = np.column_stack([
+        cons.max_velocity_error,
+        cons.max_area_ratio,
+        cons.max_aspect_ratio,
+        cons.class_flips.astype(float),
+        cons.id_switches.astype(float),
+        cons.max_conf_drop,
+    ]).reshape(-1, 6)
+    limits = np.array([max_velocity_error_px_s, max_area_ratio, max_aspect_ratio, 0.0, 0.0, max_conf_drop], dtype=float)
+    eligible = cons.num_points >= 2
+
+    pen = np.zeros_like(values)
+    pen[:, :3] = _soft_penalty(values[:, :3], limits[:3], 0.10, 0.20, 0.30)
+    # Class flips and tracker-id switches inside one track are ID-swap signatures.
+    pen[:, 3] = np.minimum(0.40, 0.20 * values[:, 3])
+    pen[:, 4] = np.minimum(0.40, 0.20 * values[:, 4])
+    pen[:, 5] = np.minimum(0.20, 0.05 + 0.30 * (values[:, 5] - limits[5]))
+    flags = eligible[:, None] & (values > limits)
+    return PenaltyBlock(
+        track_ids=cons.track_ids,
+        values=values,
+        limits=limits,
+        penalties=np.where(flags, pen, 0.0),
+        flags=flags,
+        eligible=eligible.astype(float),
+        templates=(
+            "velocity mismatch {v:.1f} px/s > {lim:.1f}",
+            "bbox area x{v:.2f} > x{lim:.2f}",
+            "bbox aspect x{v:.2f} > x{lim:.2f}",
+            "class flips {v:.0f} within track",
+            "tracker id switches {v:.0f} within track",
+            "confidence drop {v:.2f} > {lim:.2f}",
+        ),
+    )
+
+def heuristic_score_arrays(
+    stats: StatsArrays,
     max_speed_px_s: float,
     max_accel_px_s2: float,
     max_jump_px: float,
+    consistency: Optional[ConsistencyArrays] = None,
+    max_velocity_error_px_s: float = Constraints.max_velocity_error_px_s,
+    max_area_ratio: float = Constraints.max_area_ratio,
+    max_aspect_ratio: float = Constraints.max_aspect_ratio,
+    max_conf_drop: float = Constraints.max_conf_drop,
+    aggregate: str = "sum",
+    quantile: float = 0.9,
+    max_flagged: Optional[int] = None,
 ) -> Tuple[float, List[Tuple[str, str]]]:
     """
-    Returns (score 0..1, flagged [(track_id, reason), ...])
+    Array-based scorer. Returns (score 0..1, flagged [(track_id, reason), ...]).
+
+    aggregate:
+      "sum"      - 1 - sum of all penalties (heuristic_score behaviour; saturates
+                   quickly in dense scenes)
+      "mean"     - 1 - mean per-track penalty over tracks with >= 2 points
+      "quantile" - 1 - `quantile` of per-track penalties over the same tracks
+    Per-track penalties are clipped to [0, 1] for the normalized modes.
+    max_flagged keeps only the reasons of the N tracks with highest penalty.
     """
-    penalties = 0.0
-    flagged: List[Tuple[str, str]] = []
+    if aggregate not in ("sum", "mean", "quantile"):
+        raise ValueError(f"Unknown aggregate {aggregate!r}; expected 'sum', 'mean' or 'quantile'")
+    if not 0.0 <= quantile <= 1.0:
+        raise ValueError(f"quantile must be in [0, 1], got {quantile!r}")
 
-    for tid, st in track_stats.items():
-        if st.num_points < 2:
-            continue
+    blocks = [motion_block(stats, max_speed_px_s, max_accel_px_s2, max_jump_px)]
+    if consistency is not None:
+        blocks.append(consistency_block(
+            consistency, max_velocity_error_px_s, max_area_ratio, max_aspect_ratio, max_conf_drop,
+        ))
 
-        # Soft penalties so score degrades gracefully.
-        if st.max_speed > max_speed_px_s:
-            over = (st.max_speed - max_speed_px_s) / max_speed_px_s
-            penalties += min(0.35, 0.10 + 0.25 * over)
-            flagged.append((tid, f"speed {st.max_speed:.1f} px/s > {max_speed_px_s:.1f}"))
+    need_per_track = aggregate != "sum" or max_flagged is not None
+    if need_per_track:
+        # Tracks may appear in several blocks; align them on the union of ids.
+        if all(b.track_ids == stats.track_ids for b in blocks):
+            n = len(stats.track_ids)
+            inv = np.tile(np.arange(n), len(blocks))
+        else:
+            all_ids = np.array([tid for b in blocks for tid in b.track_ids], dtype=str)
+            _, inv = np.unique(all_ids, return_inverse=True)
+            inv = inv.reshape(-1)
+            n = int(inv.max()) + 1 if inv.size else 0
+        per_track = np.bincount(inv, weights=np.concatenate([b.penalties.sum(axis=1) for b in blocks]), minlength=n)
+        counted = np.bincount(inv, weights=np.concatenate([b.eligible for b in blocks]), minlength=n) > 0
 
-        if st.max_accel > max_accel_px_s2:
-            over = (st.max_accel - max_accel_px_s2) / max_accel_px_s2
-            penalties += min(0.45, 0.15 + 0.30 * over)
-            flagged.append((tid, f"accel {st.max_accel:.1f} px/s^2 > {max_accel_px_s2:.1f}"))
+    if aggregate == "sum":
+        # Sequential cumsum keeps the exact float result of the old per-track loop.
+        flat = np.concatenate([b.penalties.ravel() for b in blocks])
+        flat = flat[flat > 0]
+        penalties = float(np.cumsum(flat)[-1]) if flat.size else 0.0
+        score = max(0.0, 1.0 - penalties)
+    else:
+        p = np.clip(per_track[counted], 0.0, 1.0)
+        if p.size == 0:
+            score = 1.0
+        elif aggregate == "mean":
+            score = float(1.0 - p.mean())
+        else:
+            score = float(1.0 - np.quantile(p, quantile))
 
-        if st.max_jump > max_jump_px:
-            over = (st.max_jump - max_jump_px) / max_jump_px
-            penalties += min(0.45, 0.15 + 0.30 * over)
-            flagged.append((tid, f"jump {st.max_jump:.1f}px > {max_jump_px:.1f}px"))
+    keep_rows = [None] * len(blocks)
+    if max_flagged is not None:
+        order = np.argsort(-per_track, kind="stable")[:max_flagged]
+        keep = np.zeros(per_track.size, dtype=bool)
+        keep[order[per_track[order] > 0]] = True
+        offset = 0
+        for k, b in enumerate(blocks):
+            keep_rows[k] = keep[inv[offset:offset + len(b.track_ids)]]
+            offset += len(b.track_ids)
 
-    score = max(0.0, 1.0 - penalties)
+    flagged: List[Tuple[str, str]] = []
+    for b, keep_b in zip(blocks, keep_rows):
+        mask = b.flags if keep_b is None else (b.flags & keep_b[:, None])
+        for r, c in zip(*np.nonzero(mask)):
+            flagged.append((b.track_ids[r], b.templates[c].format(v=b.values[r, c], lim=b.limits[c])))
     return score, flagged
 
+def heuristic_score(
+    track_stats: Dict[str, TrackStats],
+    max_speed_px_s: float,
+    max_accel_px_s2: float,
+    max_jump_px: float,
+    consistency_stats: Optional[Dict[str, ConsistencyStats]] = None,
+    max_velocity_error_px_s: float = Constraints.max_velocity_error_px_s,
+    max_area_ratio: float = Constraints.max_area_ratio,
+    max_aspect_ratio: float = Constraints.max_aspect_ratio,
+    max_conf_drop: float = Constraints.max_conf_drop,
+    aggregate: str = "sum",
+    quantile: float = 0.9,
+    max_flagged: Optional[int] = None,
+) -> Tuple[float, List[Tuple[str, str]]]:
+    """
+    Returns (score 0..1, flagged [(track_id, reason), ...])
+    Tracker-consistency penalties apply only when consistency_stats is given.
+    See heuristic_score_arrays for aggregate/quantile/max_flagged.
+    """
+    return heuristic_score_arrays(
+        stack_track_stats(track_stats),
+        max_speed_px_s=max_speed_px_s,
+        max_accel_px_s2=max_accel_px_s2,
+        max_jump_px=max_jump_px,
+        consistency=stack_consistency_stats(consistency_stats) if consistency_stats is not None else None,
+        max_velocity_error_px_s=max_velocity_error_px_s,
+        max_area_ratio=max_area_ratio,
+        max_aspect_ratio=max_aspect_ratio,
+        max_conf_drop=max_conf_drop,
+        aggregate=aggregate,
+        quantile=quantile,
+        max_flagged=max_flagged,
+    )
@@ -14,3 +14,10 @@ def combine_scores(heuristic: float, model: float | None) -> Tuple[float, str]:
     final = max(0.0, min(1.0, float(final)))
     return final, "blend_0.6_model_0.4_heuristic"
 
+
+def verdict_from_score(score: float, ok_th: float, q_th: float) -> str:
+    if score >= ok_th:
+        return "OK"
+    if score >= q_th:
+        return "QUESTIONABLE"
+    return "IMPLAUSIBLE"
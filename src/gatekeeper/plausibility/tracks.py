@@ -0,0 +1,112 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from ..io.schema import ClipDetections
+
+@dataclass(frozen=True)
+class TrackArrays:
+    """
+    Flat, track-major view of a clip's detections.
+
+    Rows are sorted by (track, t). Track j owns rows starts[j]:starts[j + 1].
+    Tracks are numbered in order of first appearance in the clip.
+    Optional fields (confidence, velocity) are NaN where missing; a missing
+    tracker track_id is -1.
+    """
+    track_ids: List[str]
+    track_idx: np.ndarray   # (N,) int, index into track_ids
+    starts: np.ndarray      # (T,) int, first row of each track
+    t: np.ndarray           # (N,)
+    bbox: np.ndarray        # (N, 4) xyxy
+    class_code: np.ndarray  # (N,) int, index into class_names
+    class_names: List[str]
+    confidence: np.ndarray  # (N,)
+    velocity: np.ndarray    # (N, 2) px/s
+    tracker_id: np.ndarray  # (N,) int, DetectedObject.track_id
+
+    @property
+    def num_tracks(self) -> int:
+        return len(self.track_ids)
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(np.append(self.starts, self.t.size))
+
+    @property
+    def same_track(self) -> np.ndarray:
+        """
+        (N,) bool; True where row i and row i-1 belong to the same track.
+        """
+        same = np.zeros(self.t.size, dtype=bool)
+        same[1:] = self.track_idx[1:] == self.track_idx[:-1]
+        return same
+
+def build_track_arrays(det: ClipDetections) -> TrackArrays:
+    """
+    Flattens detections once; all downstream checks are pure array ops.
+    """
+    return build_batch_track_arrays([det])[0]
+
+def build_batch_track_arrays(dets: Sequence[ClipDetections]) -> Tuple[TrackArrays, np.ndarray]:
+    """
+    Flattens many clips into one TrackArrays in a single pass.
+    Tracks are keyed by (clip, object id), so equal ids never merge across
+    clips. Returns (arrays, track_offsets): clip k owns tracks
+    track_offsets[k]:track_offsets[k + 1].
+    """
+    # Single pass over the objects into one flat float buffer; dicts hand out
+    # track/class codes in order of first appearance, so no string sorting
+    # is needed afterwards.
+    track_of: Dict[Tuple[int, str], int] = {}
+    class_of: Dict[str, int] = {}
+    nan = float("nan")
+    missing_v = (nan, nan)
+    flat: List[float] = []
+    push = flat.extend
+    for k, det in enumerate(dets):
+        for fr in det.frames:
+            ft = float(fr.t)
+            for o in fr.objects:
+                c = o.confidence
+                push((
+                    track_of.setdefault((k, o.id), len(track_of)),
+                    class_of.setdefault(o.class_name, len(class_of)),
+                    -1 if o.track_id is None else o.track_id,
+                    ft, *o.bbox_xyxy,
+                    nan if c is None else c,
+                    *(o.velocity_px_s or missing_v),
+                ))
+    data = np.fromiter(flat, dtype=float, count=len(flat)).reshape(-1, 11)
+
+    track_idx = data[:, 0].astype(np.int64)
+    t = data[:, 3]
+    track_clip = np.array([k for k, _ in track_of], dtype=np.int64)
+    track_offsets = np.searchsorted(track_clip, np.arange(len(dets) + 1))
+
+    order = np.lexsort((t, track_idx))
+    track_idx = track_idx[order]
+    starts = np.flatnonzero(np.r_[True, track_idx[1:] != track_idx[:-1]]) if track_idx.size else np.zeros(0, dtype=np.int64)
+
+    data = data[order]
+    arr = TrackArrays(
+        track_ids=[oid for _, oid in track_of],
+        track_idx=track_idx,
+        starts=starts,
+        t=data[:, 3],
+        bbox=data[:, 4:8],
+        class_code=data[:, 1].astype(np.int64),
+        class_names=list(class_of),
+        confidence=data[:, 8],
+        velocity=data[:, 9:11],
+        tracker_id=data[:, 2].astype(np.int64),
+    )
+    return arr, track_offsets
+
+def segment_max(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Per-track max of a row-aligned, non-negative array (0 for empty input).
+    """
+    if values.size == 0:
+        return np.zeros(starts.size, dtype=float)
+    return np.maximum.reduceat(values, starts)
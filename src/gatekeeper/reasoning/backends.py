@@ -0,0 +1,208 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import re
+import shlex
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Type
+
+from ..config import Settings
+from ..plausibility.scoring import verdict_from_score
+from .cosmos_client import CosmosClient, CosmosResponse
+
+class ReasoningBackend(ABC):
+    """
+    Anything with infer(system, user) -> CosmosResponse.
+    Backends never raise from infer; failures are reported via status='error'.
+    """
+    name: str = "base"
+
+    @property
+    def provider(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def infer(self, system: str, user: str) -> CosmosResponse:
+        ...
+
+    async def ainfer(self, system: str, user: str, executor: Optional[Executor] = None) -> CosmosResponse:
+        """
+        Async variant. Default runs the blocking infer() in `executor`
+        (or the loop's default executor).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.infer, system, user)
+
+    @classmethod
+    @abstractmethod
+    def from_settings(cls, settings: Settings) -> "ReasoningBackend":
+        ...
+
+_BACKENDS: Dict[str, Type[ReasoningBackend]] = {}
+
+def register_backend(name: str) -> Callable[[Type[ReasoningBackend]], Type[ReasoningBackend]]:
+    def deco(cls: Type[ReasoningBackend]) -> Type[ReasoningBackend]:
+        cls.name = name
+        _BACKENDS[name] = cls
+        return cls
+    return deco
+
+def available_backends() -> list:
+    return sorted(_BACKENDS)
+
+def make_backend(settings: Optional[Settings] = None) -> ReasoningBackend:
+    settings = settings or Settings()
+    name = settings.reasoning_backend
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown reasoning backend {name!r}; choose from {available_backends()}")
+    return _BACKENDS[name].from_settings(settings)
+
+def prompt_key(system: str, user: str) -> str:
+    """
+    Stable key for recorded responses.
+    """
+    h = hashlib.sha256()
+    h.update(system.encode("utf-8"))
+    h.update(b"\0")
+    h.update(user.encode("utf-8"))
+    return h.hexdigest()
+
+@register_backend("http")
+class HttpBackend(ReasoningBackend):
+    """
+    The original HTTP client; still returns 'skipped' without URL/key.
+    """
+    def __init__(self, client: CosmosClient):
+        self.client = client
+
+    @property
+    def provider(self) -> str:
+        return "cosmos"
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "HttpBackend":
+        return cls(CosmosClient(settings.cosmos_api_url, settings.cosmos_api_key, model=settings.cosmos_model))
+
+    def infer(self, system: str, user: str) -> CosmosResponse:
+        return self.client.infer(system, user)
+
+_TRACK_RE = re.compile(
+    r"^- (?P<tid>\S+): points=\d+, max_speed=(?P<speed>[\d.]+)px/s, "
+    r"max_accel=(?P<accel>[\d.]+)px/s\^2, max_jump=(?P<jump>[\d.]+)px",
+    flags=re.MULTILINE,
+)
+_LIMIT_RE = re.compile(r"^- (max_\w+): ([\d.]+)$", flags=re.MULTILINE)
+
+def rule_based_answer(user: str, ok_threshold: float, questionable_threshold: float) -> str:
+    """
+    Deterministic stand-in for the model: re-reads the track summaries and
+    constraints from the prompt and answers in the requested JSON shape.
+    """
+    limits = {k: float(v) for k, v in _LIMIT_RE.findall(user)}
+    checks = (
+        ("speed", "max_speed_px_s"),
+        ("accel", "max_accel_px_s2"),
+        ("jump", "max_jump_px"),
+    )
+    flagged = []
+    for m in _TRACK_RE.finditer(user):
+        over = [field for field, lim in checks if lim in limits and float(m.group(field)) > limits[lim]]
+        if over:
+            flagged.append({"object_id": m.group("tid"), "reason": f"exceeds {', '.join(over)} limit"})
+
+    score = max(0.0, 1.0 - 0.3 * len(flagged))
+    verdict = verdict_from_score(score, ok_threshold, questionable_threshold)
+    explanation = (
+        f"{len(flagged)} track(s) exceed the stated motion constraints."
+        if flagged else "All track summaries are within the stated motion constraints."
+    )
+    return json.dumps({
+        "plausibility_score": score,
+        "verdict": verdict,
+        "explanation": explanation,
+        "flagged_objects": flagged,
+    })
+
+@register_backend("replay")
+class ReplayBackend(ReasoningBackend):
+    """
+    Offline backend. Answers from recorded responses keyed by prompt_key();
+    prompts with no recording get rule_based_answer(). latency_s simulates
+    model latency for throughput measurements.
+    """
+    def __init__(
+        self,
+        recorded: Optional[Dict[str, str]] = None,
+        latency_s: float = 0.0,
+        ok_threshold: float = Settings.ok_threshold,
+        questionable_threshold: float = Settings.questionable_threshold,
+    ):
+        self.recorded = recorded or {}
+        self.latency_s = latency_s
+        self.ok_threshold = ok_threshold
+        self.questionable_threshold = questionable_threshold
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ReplayBackend":
+        recorded: Dict[str, str] = {}
+        if settings.replay_path:
+            recorded = json.loads(Path(settings.replay_path).read_text(encoding="utf-8"))
+        return cls(
+            recorded,
+            latency_s=settings.backend_latency_s,
+            ok_threshold=settings.ok_threshold,
+            questionable_threshold=settings.questionable_threshold,
+        )
+
+    def _answer(self, system: str, user: str) -> CosmosResponse:
+        raw = self.recorded.get(prompt_key(system, user))
+        if raw is None:
+            raw = rule_based_answer(user, self.ok_threshold, self.questionable_threshold)
+        return CosmosResponse(raw_text=raw, status="ok")
+
+    def infer(self, system: str, user: str) -> CosmosResponse:
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        return self._answer(system, user)
+
+    async def ainfer(self, system: str, user: str, executor: Optional[Executor] = None) -> CosmosResponse:
+        # Simulated latency does not need a thread.
+        if self.latency_s > 0:
+            await asyncio.sleep(self.latency_s)
+        return self._answer(system, user)
+
+@register_backend("subprocess")
+class SubprocessBackend(ReasoningBackend):
+    """
+    Runs a local model command per request. The command receives
+    {"system": ..., "user": ...} as JSON on stdin and prints its answer.
+    """
+    def __init__(self, command: Optional[str], timeout_s: int = 60):
+        self.command = command
+        self.timeout_s = timeout_s
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SubprocessBackend":
+        return cls(settings.subprocess_cmd)
+
+    def infer(self, system: str, user: str) -> CosmosResponse:
+        if not self.command:
+            return CosmosResponse(raw_text="", status="skipped")
+        try:
+            proc = subprocess.run(
+                shlex.split(self.command),
+                input=json.dumps({"system": system, "user": user}),
+                capture_output=True,
+                text=True,
+                timeout=self.timeout_s,
+            )
+        except Exception as e:
+            return CosmosResponse(raw_text=f"{type(e).__name__}: {e}", status="error")
+        if proc.returncode != 0:
+            return CosmosResponse(raw_text=proc.stderr.strip()[:2000], status="error")
+        return CosmosResponse(raw_text=proc.stdout, status="ok")
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from pathlib import Path
+import pytest
+from gatekeeper.async_pipeline import ClipJobError, run_gatekeeper_many
+from gatekeeper.config import Settings
+from gatekeeper.pipeline import run_gatekeeper
+from gatekeeper.reasoning.backends import ReplayBackend
+
+SAMPLES = Path(__file__).resolve().parents[1] / "data" / "samples"
+
+def _jobs(tmp_path, n):
+    jobs = []
+    for k in range(n):
+        src = SAMPLES / f"clip_0{k % 3 + 1}_detections.json"
+        data = json.loads(src.read_text(encoding="utf-8"))
+        data["meta"]["clip_id"] = f"clip_{k}"
+        p = tmp_path / f"clip_{k}_detections.json"
+        p.write_text(json.dumps(data), encoding="utf-8")
+        jobs.append((tmp_path / f"clip_{k}.mp4", p))
+    return jobs
+
+class PeakInFlightBackend(ReplayBackend):
+    """
+    Replay backend that records how many calls were awaiting at once.
+    Calls are held until `target` are in flight together, so a pipeline that
+    serializes model calls times out instead of passing by luck.
+    """
+    def __init__(self, target: int):
+        super().__init__()
+        self.target = target
+        self.in_flight = 0
+        self.peak = 0
+        self.reached = None
+
+    async def ainfer(self, system, user, executor=None):
+        # Created lazily: on Python 3.9 an Event binds to the loop current at init.
+        if self.reached is None:
+            self.reached = asyncio.Event()
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        if self.peak >= self.target:
+            self.reached.set()
+        try:
+            await asyncio.wait_for(self.reached.wait(), timeout=5.0)
+            return self._answer(system, user)
+        finally:
+            self.in_flight -= 1
+
+def test_async_matches_sync_and_overlaps_model_calls(tmp_path):
+    jobs = _jobs(tmp_path, 8)
+    settings = Settings(reasoning_backend="replay")
+    backend = PeakInFlightBackend(target=4)
+
+    outs = run_gatekeeper_many(
+        jobs, outputs_dir=tmp_path / "async", try_overlay=False, settings=settings, concurrency=4, backend=backend,
+    )
+
+    expected = [run_gatekeeper(c, d, outputs_dir=tmp_path / "sync", try_overlay=False, settings=settings) for c, d in jobs]
+    assert outs == expected
+    assert len(list((tmp_path / "async" / "reports").glob("*_verdict.json"))) == 8
+    # Model calls overlap up to, and never beyond, the concurrency limit.
+    assert backend.peak == 4
+
+def test_failed_job_does_not_drop_other_results(tmp_path):
+    jobs = _jobs(tmp_path, 5)
+    jobs[2][1].unlink()
+    settings = Settings(reasoning_backend="replay")
+
+    with pytest.raises(ClipJobError) as info:
+        run_gatekeeper_many(jobs, outputs_dir=tmp_path / "out", try_overlay=False, settings=settings, concurrency=2)
+
+    err = info.value
+    assert [i for i, _ in err.failures] == [2]
+    assert err.results[2] is None
+    assert [o.clip_id for o in err.results if o is not None] == ["clip_0", "clip_1", "clip_3", "clip_4"]
+    assert len(list((tmp_path / "out" / "reports").glob("*_verdict.json"))) == 4
@@ -0,0 +1,67 @@
+import json
+import sys
+import pytest
+from gatekeeper.config import Settings
+from gatekeeper.reasoning.backends import (
+    ReasoningBackend, ReplayBackend, SubprocessBackend, make_backend, prompt_key,
+)
+from gatekeeper.reasoning.postprocess import parse_model_output
+
+USER = (
+    "Track summaries (pixel-space, bbox-center):\n"
+    "- trk_1: points=2, max_speed=50.0px/s, max_accel=0.0px/s^2, max_jump=2.0px\n"
+    "- trk_2: points=2, max_speed=2000.0px/s, max_accel=0.0px/s^2, max_jump=70.0px\n\n"
+    "Constraints:\n"
+    "- max_speed_px_s: 900.0\n"
+    "- max_accel_px_s2: 6000.0\n"
+    "- max_jump_px: 120.0\n"
+)
+
+def test_replay_recorded_and_rule_based_fallback():
+    backend = ReplayBackend({prompt_key("sys", USER): '{"plausibility_score": 0.1}'})
+    assert backend.infer("sys", USER).raw_text == '{"plausibility_score": 0.1}'
+
+    resp = backend.infer("other", USER)
+    score, verdict, _, flagged = parse_model_output(resp.raw_text)
+    assert resp.status == "ok"
+    assert [f["object_id"] for f in flagged] == ["trk_2"]
+    assert verdict == "OK" and score == pytest.approx(0.7)
+
+def test_subprocess_backend_echoes_stdin():
+    cmd = f'"{sys.executable}" -c "import sys, json; print(json.load(sys.stdin)[\'user\'])"'
+    resp = SubprocessBackend(cmd).infer("sys", "hello")
+    assert resp.status == "ok" and resp.raw_text.strip() == "hello"
+
+    assert SubprocessBackend(None).infer("sys", "hello").status == "skipped"
+
+def test_make_backend_selects_from_settings():
+    assert make_backend(Settings(reasoning_backend="replay")).name == "replay"
+    assert make_backend(Settings(reasoning_backend="http")).provider == "cosmos"
+    with pytest.raises(ValueError):
+        make_backend(Settings(reasoning_backend="nope"))
+
+def test_incomplete_backend_fails_on_creation():
+    class NoInfer(ReasoningBackend):
+        @classmethod
+        def from_settings(cls, settings):
+            return cls()
+
+    with pytest.raises(TypeError):
+        NoInfer()
+
+def test_rule_based_verdict_uses_thresholds():
+    _, verdict, _, _ = parse_model_output(ReplayBackend(ok_threshold=0.8).infer("sys", USER).raw_text)
+    assert verdict == "QUESTIONABLE"
+
+def test_run_gatekeeper_uses_injected_backend(tmp_path):
+    from pathlib import Path
+    from gatekeeper.pipeline import prepare_clip, run_gatekeeper
+
+    det = Path(__file__).resolve().parents[1] / "data" / "samples" / "clip_01_detections.json"
+    settings = Settings(reasoning_backend="http")
+    prompt = prepare_clip(det, settings).prompt
+    backend = ReplayBackend({prompt_key(prompt["system"], prompt["user"]): '{"explanation": "recorded"}'})
+
+    out = run_gatekeeper("x.mp4", det, outputs_dir=tmp_path, try_overlay=False, settings=settings, backend=backend)
+    assert out.explanation == "recorded"
+    assert out.evidence.model.provider == "replay"
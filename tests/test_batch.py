@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from gatekeeper.io.schema import ClipDetections
+from gatekeeper.plausibility.batch import batch_heuristic_scores
+from gatekeeper.plausibility.consistency import compute_consistency_stats
+from gatekeeper.plausibility.heuristics import compute_track_stats, heuristic_score
+from gatekeeper.plausibility.tracks import build_track_arrays
+
+LIMITS = dict(max_speed_px_s=900.0, max_accel_px_s2=6000.0, max_jump_px=120.0)
+
+def _random_clip(rng, k):
+    frames = []
+    for f in range(int(rng.integers(0, 8))):
+        objs = []
+        for _ in range(int(rng.integers(0, 4))):
+            x, y = rng.uniform(0, 300, 2)
+            w, h = rng.uniform(5, 60, 2)
+            objs.append({
+                "id": f"o{rng.integers(0, 4)}",
+                "class": str(rng.choice(["car", "car", "person"])),
+                "bbox_xyxy": [x, y, x + w, y + h],
+                "confidence": float(rng.uniform(0, 1)),
+            })
+        frames.append({"t": f / 10, "objects": objs})
+    meta = {"clip_id": f"c{k}", "fps": 10, "frame_width": 640, "frame_height": 480}
+    return ClipDetections.model_validate({"meta": meta, "frames": frames})
+
+@pytest.mark.parametrize("kwargs", [
+    {}, {"aggregate": "mean"}, {"aggregate": "quantile", "quantile": 0.75}, {"max_flagged": 1},
+])
+def test_batch_matches_per_clip(kwargs):
+    rng = np.random.default_rng(0)
+    dets = [_random_clip(rng, k) for k in range(40)]
+    batch = batch_heuristic_scores(dets, **LIMITS, **kwargs)
+
+    assert batch.clip_ids == [d.meta.clip_id for d in dets]
+    for i, det in enumerate(dets):
+        ts = compute_track_stats(det)
+        cs = compute_consistency_stats(build_track_arrays(det))
+        score, flagged = heuristic_score(ts, **LIMITS, consistency_stats=cs, **kwargs)
+        assert batch.scores[i] == pytest.approx(score)
+        assert batch.flagged[i] == flagged
+        assert batch.track_stats(i) == ts
+
+@pytest.mark.parametrize("kwargs", [{"aggregate": "max"}, {"aggregate": "quantile", "quantile": -0.1}])
+def test_batch_rejects_bad_aggregation(kwargs):
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        batch_heuristic_scores([_random_clip(rng, 0)], **LIMITS, **kwargs)
@@ -0,0 +1,54 @@
+from gatekeeper.io.schema import ClipDetections
+from gatekeeper.plausibility.consistency import compute_consistency_stats
+from gatekeeper.plausibility.heuristics import heuristic_score
+from gatekeeper.plausibility.tracks import build_track_arrays
+
+def _clip(frames):
+    meta = {"clip_id": "x", "fps": 10, "frame_width": 640, "frame_height": 480}
+    return ClipDetections.model_validate({"meta": meta, "frames": frames})
+
+def _obj(oid, cls, bbox, conf=0.9, vel=None, track_id=None):
+    return {"id": oid, "class": cls, "bbox_xyxy": bbox, "confidence": conf, "velocity_px_s": vel, "track_id": track_id}
+
+def test_consistency_flags_id_swap_and_shape_jump():
+    det = _clip([
+        {"t": 0.0, "objects": [_obj("a", "car", [0, 0, 40, 20], vel=[100, 0]), _obj("b", "car", [100, 100, 140, 120])]},
+        {"t": 0.1, "objects": [_obj("a", "car", [10, 0, 50, 20], vel=[100, 0]), _obj("b", "person", [100, 100, 110, 160], conf=0.2)]},
+        {"t": 0.2, "objects": [_obj("a", "car", [20, 0, 60, 20], vel=[100, 0])]},
+    ])
+    stats = compute_consistency_stats(build_track_arrays(det))
+
+    a, b = stats["a"], stats["b"]
+    assert a.num_points == 3 and b.num_points == 2
+    assert a.max_velocity_error < 1e-6
+    assert a.class_flips == 0 and a.max_area_ratio == 1.0
+    assert b.class_flips == 1
+    assert b.max_aspect_ratio > 10
+    assert abs(b.max_conf_drop - 0.7) < 1e-9
+
+    score, flagged = heuristic_score({}, 900.0, 6000.0, 120.0, consistency_stats=stats)
+    assert score < 1.0
+    assert {tid for tid, _ in flagged} == {"b"}
+
+def test_consistency_velocity_disagreement():
+    det = _clip([
+        {"t": 0.0, "objects": [_obj("a", "car", [0, 0, 40, 20])]},
+        {"t": 0.1, "objects": [_obj("a", "car", [10, 0, 50, 20], vel=[-500, 0])]},
+    ])
+    stats = compute_consistency_stats(build_track_arrays(det))
+    assert abs(stats["a"].max_velocity_error - 600.0) < 1e-6
+
+def test_consistency_counts_tracker_id_switches():
+    det = _clip([
+        {"t": 0.0, "objects": [_obj("a", "car", [0, 0, 40, 20], track_id=1), _obj("b", "car", [100, 0, 140, 20], track_id=5)]},
+        {"t": 0.1, "objects": [_obj("a", "car", [1, 0, 41, 20], track_id=2), _obj("b", "car", [100, 0, 140, 20])]},
+        {"t": 0.2, "objects": [_obj("a", "car", [2, 0, 42, 20], track_id=1), _obj("b", "car", [100, 0, 140, 20], track_id=5)]},
+    ])
+    stats = compute_consistency_stats(build_track_arrays(det))
+    assert stats["a"].id_switches == 2
+    # Missing track_id is not counted as a switch.
+    assert stats["b"].id_switches == 0
+
+    score, flagged = heuristic_score({}, 900.0, 6000.0, 120.0, consistency_stats=stats)
+    assert score == 1.0 - 0.40
+    assert flagged == [("a", "tracker id switches 2 within track")]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from gatekeeper.plausibility.consistency import ConsistencyStats
+from gatekeeper.plausibility.heuristics import TrackStats, heuristic_score
+
+LIMITS = dict(max_speed_px_s=900.0, max_accel_px_s2=6000.0, max_jump_px=120.0)
+
+def _reference_score(track_stats, consistency_stats):
+    # Per-track loop the array scorer must reproduce in "sum" mode.
+    penalties = 0.0
+    flagged = []
+    for tid, st in track_stats.items():
+        if st.num_points < 2:
+            continue
+        if st.max_speed > 900.0:
+            penalties += min(0.35, 0.10 + 0.25 * (st.max_speed - 900.0) / 900.0)
+            flagged.append((tid, f"speed {st.max_speed:.1f} px/s > 900.0"))
+        if st.max_accel > 6000.0:
+            penalties += min(0.45, 0.15 + 0.30 * (st.max_accel - 6000.0) / 6000.0)
+            flagged.append((tid, f"accel {st.max_accel:.1f} px/s^2 > 6000.0"))
+        if st.max_jump > 120.0:
+            penalties += min(0.45, 0.15 + 0.30 * (st.max_jump - 120.0) / 120.0)
+            flagged.append((tid, f"jump {st.max_jump:.1f}px > 120.0px"))
+    for tid, cs in consistency_stats.items():
+        if cs.num_points < 2:
+            continue
+        if cs.max_area_ratio > 2.0:
+            penalties += min(0.30, 0.10 + 0.20 * (cs.max_area_ratio - 2.0) / 2.0)
+            flagged.append((tid, f"bbox area x{cs.max_area_ratio:.2f} > x2.00"))
+        if cs.class_flips > 0:
+            penalties += min(0.40, 0.20 * cs.class_flips)
+            flagged.append((tid, f"class flips {cs.class_flips} within track"))
+    return max(0.0, 1.0 - penalties), flagged
+
+def _random_stats(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = {
+        f"t{k}": TrackStats(f"t{k}", float(rng.uniform(0, 1100)), float(rng.uniform(0, 7000)),
+                            float(rng.uniform(0, 130)), int(rng.integers(1, 5)))
+        for k in range(n)
+    }
+    cs = {
+        f"t{k}": ConsistencyStats(f"t{k}", 0.0, float(rng.uniform(1, 2.3)), 1.0,
+                                  int(rng.random() < 0.02), 0, 0.0, ts[f"t{k}"].num_points)
+        for k in range(n)
+    }
+    return ts, cs
+
+def test_sum_mode_matches_per_track_loop():
+    ts, cs = _random_stats(300)
+    for n in (3, 300):
+        sub_ts = dict(list(ts.items())[:n])
+        sub_cs = dict(list(cs.items())[:n])
+        expected = _reference_score(sub_ts, sub_cs)
+        assert heuristic_score(sub_ts, **LIMITS, consistency_stats=sub_cs) == expected
+    assert heuristic_score({}, **LIMITS) == (1.0, [])
+
+def test_normalized_aggregation_and_top_offenders():
+    ts = {
+        "a": TrackStats("a", 2000.0, 0.0, 0.0, 5),
+        "b": TrackStats("b", 10.0, 0.0, 0.0, 5),
+        "c": TrackStats("c", 950.0, 0.0, 0.0, 5),
+        "d": TrackStats("d", 5000.0, 0.0, 0.0, 1),
+    }
+    score_sum, _ = heuristic_score(ts, **LIMITS)
+    score_mean, _ = heuristic_score(ts, **LIMITS, aggregate="mean")
+    score_q, _ = heuristic_score(ts, **LIMITS, aggregate="quantile", quantile=0.5)
+    pa = min(0.35, 0.10 + 0.25 * 1100.0 / 900.0)
+    pc = 0.10 + 0.25 * 50.0 / 900.0
+    assert score_sum == pytest.approx(1.0 - pa - pc)
+    assert score_mean == pytest.approx(1.0 - (pa + pc) / 3)
+    assert score_q == pytest.approx(1.0 - pc)
+
+    _, flagged = heuristic_score(ts, **LIMITS, max_flagged=1)
+    assert [tid for tid, _ in flagged] == ["a"]
+    with pytest.raises(ValueError):
+        heuristic_score(ts, **LIMITS, aggregate="max")
+    with pytest.raises(ValueError):
+        heuristic_score(ts, **LIMITS, aggregate="quantile", quantile=1.5)